@@ -5,6 +5,7 @@ to recommend recipes based on available ingredients using semantic similarity.
 """
 
 # Set environment variables to avoid TensorFlow conflicts
+import hashlib
 import os
 import sys
 import warnings
@@ -20,9 +21,236 @@ warnings.filterwarnings('ignore')
 from sentence_transformers import SentenceTransformer
 import numpy as np
 import json
+from collections import OrderedDict
 from typing import List, Dict, Optional, Union
 from pathlib import Path
 
+# Optional SIMD-accelerated similarity kernels (AVX2/AVX-512/NEON).
+# Falls back to plain NumPy when the package isn't installed.
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Optional Rust-backed JSON parser, 3-10x faster than the stdlib on the
+# large recipe files. Falls back to json when not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional Numba JIT for the hot scoring loops. Falls back to vectorized
+# NumPy when the package isn't installed.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Optional ONNX Runtime path: runs the MiniLM encoder through a persistent
+# onnxruntime session with fused graph optimizations instead of PyTorch.
+# Falls back to the regular SentenceTransformer when not installed.
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+except ImportError:
+    onnxruntime = None
+
+# LRU cache of query embeddings, keyed on (model identity, normalized
+# ingredient tuple). UI clients frequently resubmit the same ingredient
+# set (pagination, re-ranking); a hit skips the transformer forward pass
+# entirely. Module-level because instance methods aren't lru_cache-able.
+_ENCODE_CACHE: OrderedDict = OrderedDict()
+_ENCODE_CACHE_MAX = 1024
+
+# Per-byte popcount lookup table, used to count set bits in the packed
+# uint64 ingredient bitmasks by viewing them as bytes
+_POPCOUNT8 = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1
+).sum(axis=1).astype(np.uint8)
+
+
+def _popcount_rows(masks: np.ndarray) -> np.ndarray:
+    """Count set bits per row of a 2D uint64 bitmask array."""
+    return _POPCOUNT8[masks.view(np.uint8).reshape(masks.shape[0], -1)].sum(axis=1)
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _score_all_masks(recipe_masks, recipe_totals, query_mask):
+        """
+        Exact-overlap fraction per recipe: popcount(mask & query) / total.
+        Compiled to a tight native loop with one prange thread per chunk
+        of recipes; popcount uses Kernighan's bit-clearing trick.
+        """
+        n = recipe_masks.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            matched = 0
+            for w in range(recipe_masks.shape[1]):
+                v = recipe_masks[i, w] & query_mask[w]
+                while v:
+                    v &= v - np.uint64(1)
+                    matched += 1
+            total = recipe_totals[i]
+            out[i] = matched / total if total > 0 else 0.0
+        return out
+    @njit(cache=True)
+    def _select_topk(scores, k):
+        """Indices and values of the k largest scores, descending."""
+        n = scores.shape[0]
+        kk = min(k, n)
+        top_idx = np.empty(kk, dtype=np.int64)
+        top_val = np.empty(kk, dtype=np.float32)
+        taken = np.zeros(n, dtype=np.bool_)
+        for j in range(kk):
+            best = np.float32(-2.0)
+            best_i = 0
+            for i in range(n):
+                if not taken[i] and scores[i] > best:
+                    best = scores[i]
+                    best_i = i
+            taken[best_i] = True
+            top_idx[j] = best_i
+            top_val[j] = best
+        return top_idx, top_val
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sim_topk(emb, q, k):
+        """
+        Fused cosine similarity + top-k selection in one pass over the
+        embedding matrix: per-row dot and norm are accumulated together
+        (no normalized-copy intermediate), then only the k winners are
+        extracted. Rows are unit-norm in practice, so the per-row norm is
+        just a guard for legacy caches.
+        """
+        n, d = emb.shape
+        q_norm = 0.0
+        for j in range(d):
+            q_norm += q[j] * q[j]
+        q_norm = np.sqrt(q_norm)
+
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            dot = 0.0
+            norm2 = 0.0
+            for j in range(d):
+                v = emb[i, j]
+                dot += v * q[j]
+                norm2 += v * v
+            if norm2 > 0.0:
+                scores[i] = dot / (np.sqrt(norm2) * q_norm)
+            else:
+                scores[i] = 0.0
+
+        return _select_topk(scores, k)
+
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _sim_topk_384(emb, q, k):
+        """
+        _sim_topk specialized on the MiniLM embedding width. The inner
+        loops run over a compile-time constant 384 trip count, which LLVM
+        fully vectorizes with no loop-bound overhead (12x32 AVX2 lanes /
+        6x64 AVX-512 lanes).
+        """
+        n = emb.shape[0]
+        q_norm = 0.0
+        for j in range(384):
+            q_norm += q[j] * q[j]
+        q_norm = np.sqrt(q_norm)
+
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            dot = 0.0
+            norm2 = 0.0
+            for j in range(384):
+                v = emb[i, j]
+                dot += v * q[j]
+                norm2 += v * v
+            if norm2 > 0.0:
+                scores[i] = dot / (np.sqrt(norm2) * q_norm)
+            else:
+                scores[i] = 0.0
+
+        return _select_topk(scores, k)
+else:
+    _score_all_masks = None
+    _sim_topk = None
+    _sim_topk_384 = None
+
+
+class _OnnxEncoder:
+    """
+    Drop-in replacement for SentenceTransformer.encode backed by a
+    persistent ONNX Runtime session. The model is exported once (cached
+    under ml-model/model_cache) and reused across runs; inference goes
+    through onnxruntime's fused AVX2/VNNI kernels instead of PyTorch's
+    Python-side dispatch.
+    """
+
+    def __init__(self, model_name: str, silent: bool = False):
+        cache_dir = Path(__file__).parent.parent / 'model_cache' / model_name.split('/')[-1]
+
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.intra_op_num_threads = os.cpu_count()
+        sess_options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+
+        if (cache_dir / 'model.onnx').exists():
+            if not silent:
+                print(f"Loading cached ONNX model from {cache_dir}", file=sys.stderr)
+            self._model = ORTModelForFeatureExtraction.from_pretrained(
+                cache_dir, session_options=sess_options
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(cache_dir)
+        else:
+            if not silent:
+                print(f"Exporting {model_name} to ONNX (one-time)...", file=sys.stderr)
+            self._model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True, session_options=sess_options
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(model_name)
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                self._model.save_pretrained(cache_dir)
+                self._tokenizer.save_pretrained(cache_dir)
+            except Exception as e:
+                if not silent:
+                    print(f"Warning: failed to cache ONNX model: {e}", file=sys.stderr)
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = False,
+               **_kwargs) -> np.ndarray:
+        """
+        Encode one string or a list of strings to embeddings.
+        Mean-pools token embeddings with the attention mask, matching the
+        pooling of the sentence-transformers MiniLM checkpoint, and
+        optionally L2-normalizes the result. Other keyword arguments from
+        SentenceTransformer.encode are ignored.
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            inputs = self._tokenizer(
+                batch, padding=True, truncation=True, return_tensors='np'
+            )
+            hidden = self._model(**inputs).last_hidden_state
+            hidden = np.asarray(hidden)
+            mask = inputs['attention_mask'][:, :, None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            chunks.append(pooled.astype(np.float32))
+
+        embeddings = np.concatenate(chunks, axis=0)
+        if normalize_embeddings:
+            embeddings /= np.maximum(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
+            )
+        return embeddings[0] if single else embeddings
+
 
 class RecipeRecommender:
     """
@@ -42,12 +270,30 @@ class RecipeRecommender:
         """
         self.silent = silent
         try:
-            # Load the pre-trained model from Hugging Face
+            # Load the pre-trained model from Hugging Face. Prefer the
+            # persistent ONNX Runtime session when available; fall back to
+            # the PyTorch SentenceTransformer otherwise.
             if not self.silent:
                 print(f"Loading model: {model_name}", file=sys.stderr)
-            self.model = SentenceTransformer(model_name)
+            if onnxruntime is not None:
+                try:
+                    self.model = _OnnxEncoder(model_name, silent=self.silent)
+                except Exception as e:
+                    if not self.silent:
+                        print(f"ONNX path unavailable ({e}), using PyTorch", file=sys.stderr)
+                    self.model = SentenceTransformer(model_name)
+            else:
+                self.model = SentenceTransformer(model_name)
             self.recipes = []
             self.recipe_embeddings = None
+            self.recipe_embeddings_i8 = None
+            self.recipe_i8_norms = None
+            self.ingredient_to_id = {}
+            self.recipe_names = []
+            self.ing_indptr = None
+            self.ing_indices = None
+            self.recipe_masks = None
+            self.recipe_totals = None
             if not self.silent:
                 print("Model loaded successfully", file=sys.stderr)
         except Exception as e:
@@ -78,22 +324,42 @@ class RecipeRecommender:
             raise FileNotFoundError(f"Recipe file not found: {recipe_file_path}")
         
         try:
-            # Load recipe data
-            with open(recipe_file_path, 'r', encoding='utf-8') as f:
-                self.recipes = json.load(f)
+            # Load recipe data (single read + orjson parse when available)
+            with open(recipe_file_path, 'rb') as f:
+                raw = f.read()
+            self.recipes = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             # Validate loaded data
             if not self.recipes or not isinstance(self.recipes, list):
                 raise ValueError("Recipe data is empty or invalid format")
             
-            # Validate each recipe has required fields
-            for idx, recipe in enumerate(self.recipes):
-                if 'ingredients' not in recipe or not recipe['ingredients']:
-                    raise ValueError(f"Recipe at index {idx} missing 'ingredients' field")
+            # Validate each recipe has required fields. A known-good file
+            # is trusted via a content-hash sidecar so startup doesn't
+            # rescan millions of records; set RECIPE_VALIDATE=1 to force a
+            # full check regardless.
+            digest = hashlib.md5(raw).hexdigest()
+            marker = Path(f"{recipe_file_path}.validated")
+            trusted = (
+                os.environ.get('RECIPE_VALIDATE') != '1'
+                and marker.exists()
+                and marker.read_text().strip() == digest
+            )
+            if not trusted:
+                # Single short-circuiting pass instead of a per-recipe loop
+                if not all('ingredients' in r and r['ingredients'] for r in self.recipes):
+                    raise ValueError("One or more recipes missing a non-empty 'ingredients' field")
+                try:
+                    marker.write_text(digest)
+                except OSError:
+                    pass  # read-only data dir: just revalidate next time
             
             if not self.silent:
                 print(f"Loaded {len(self.recipes)} recipes", file=sys.stderr)
-            
+
+            # Index ingredients once so per-query matching works on packed
+            # integer bitmasks instead of rebuilding Python sets per recipe
+            self._build_ingredient_index()
+
             # Pre-compute embeddings for all recipes (with caching)
             # This improves performance by avoiding re-computation on each query
             self._compute_recipe_embeddings(recipe_file_path)
@@ -103,6 +369,61 @@ class RecipeRecommender:
         except Exception as e:
             raise RuntimeError(f"Error loading recipes: {str(e)}")
     
+    def _build_ingredient_index(self) -> None:
+        """
+        Build the structure-of-arrays view of the recipe list.
+
+        Instead of walking the list-of-dicts (and re-lowercasing strings)
+        per query, the load path extracts: a flat name list, a CSR-style
+        (indptr, indices) pair of integer ingredient IDs per recipe, and
+        packed uint64 bitmasks derived from those IDs. Set intersection
+        then becomes bitwise-AND + popcount over contiguous arrays, with
+        all string normalization paid once at load time.
+        """
+        self.ingredient_to_id = {}
+        self.recipe_names = [recipe.get('name', '') for recipe in self.recipes]
+
+        # CSR layout: ingredient IDs of recipe i live in
+        # ing_indices[ing_indptr[i]:ing_indptr[i + 1]]
+        indptr = np.zeros(len(self.recipes) + 1, dtype=np.int32)
+        indices = []
+        for i, recipe in enumerate(self.recipes):
+            for ing in recipe['ingredients']:
+                key = ing.lower().strip()
+                ing_id = self.ingredient_to_id.setdefault(key, len(self.ingredient_to_id))
+                indices.append(ing_id)
+            indptr[i + 1] = len(indices)
+        self.ing_indptr = indptr
+        self.ing_indices = np.asarray(indices, dtype=np.int32)
+
+        n_words = (len(self.ingredient_to_id) + 63) // 64
+        self.recipe_masks = np.zeros((len(self.recipes), n_words), dtype=np.uint64)
+        for i in range(len(self.recipes)):
+            for ing_id in self.ing_indices[indptr[i]:indptr[i + 1]]:
+                self.recipe_masks[i, ing_id // 64] |= np.uint64(1) << np.uint64(ing_id % 64)
+
+        # Distinct-ingredient counts per recipe, the match denominator
+        self.recipe_totals = _popcount_rows(self.recipe_masks)
+
+    def _query_mask(self, user_ingredients: List[str]) -> np.ndarray:
+        """
+        Pack the user's ingredients into a bitmask over the vocabulary.
+        Ingredients not present in any recipe are ignored (they cannot
+        contribute to an exact match anyway).
+
+        Args:
+            user_ingredients: List of ingredient strings
+
+        Returns:
+            1D uint64 bitmask aligned with recipe_masks columns
+        """
+        mask = np.zeros(self.recipe_masks.shape[1], dtype=np.uint64)
+        for ing in user_ingredients:
+            ing_id = self.ingredient_to_id.get(ing.lower().strip())
+            if ing_id is not None:
+                mask[ing_id // 64] |= np.uint64(1) << np.uint64(ing_id % 64)
+        return mask
+
     def _compute_recipe_embeddings(self, recipe_file_path: str) -> None:
         """
         Pre-compute embeddings for all recipes in the database.
@@ -112,20 +433,31 @@ class RecipeRecommender:
             recipe_file_path: Path to the recipe file (used for cache filename)
         """
         try:
-            # Generate cache filename based on recipe file
-            cache_file = Path(recipe_file_path).parent / f"{Path(recipe_file_path).stem}_embeddings.npy"
+            # Generate cache filename based on recipe file.
+            # The _norm_v2 suffix marks pre-normalized embeddings; older
+            # unnormalized caches are simply ignored and rebuilt.
+            cache_file = Path(recipe_file_path).parent / f"{Path(recipe_file_path).stem}_embeddings_norm_v2.npy"
             
             # Check if cached embeddings exist and are valid
             if cache_file.exists():
                 try:
                     if not self.silent:
                         print(f"Loading cached embeddings from {cache_file.name}...", file=sys.stderr)
-                    self.recipe_embeddings = np.load(cache_file)
-                    
+                    # Memory-map the cache so the OS page cache backs the
+                    # matrix: near-zero load time, pages fault in as
+                    # queries touch them, and worker processes share one
+                    # physical copy. All downstream ops only read from it.
+                    emb = np.load(cache_file, mmap_mode='r')
+                    if emb.dtype != np.float32:
+                        # Legacy cache in a different dtype: materialize once
+                        emb = np.ascontiguousarray(emb, dtype=np.float32)
+                    self.recipe_embeddings = emb
+
                     # Verify cache matches current recipe count
                     if len(self.recipe_embeddings) == len(self.recipes):
                         if not self.silent:
                             print("✓ Cached embeddings loaded successfully", file=sys.stderr)
+                        self._load_or_build_i8_cache(cache_file)
                         return
                     else:
                         if not self.silent:
@@ -143,12 +475,21 @@ class RecipeRecommender:
             # Compute embeddings for all recipes at once (batch processing)
             if not self.silent:
                 print("Computing recipe embeddings (this may take a minute)...", file=sys.stderr)
+            # normalize_embeddings=True pushes the L2 normalization into
+            # the encoder itself, so no separate pass over the matrix is
+            # needed here; the cached matrix is unit-norm by construction.
             self.recipe_embeddings = self.model.encode(
                 recipe_texts,
                 show_progress_bar=(not self.silent),
                 convert_to_numpy=True,
+                normalize_embeddings=True,
                 batch_size=32  # Process in batches for better performance
             )
+
+            # Store as contiguous float32 so SIMD kernels hit their fast path
+            self.recipe_embeddings = np.ascontiguousarray(
+                self.recipe_embeddings, dtype=np.float32
+            )
             
             # Save embeddings to cache
             try:
@@ -159,11 +500,66 @@ class RecipeRecommender:
                 if not self.silent:
                     print(f"Warning: Failed to save cache: {e}", file=sys.stderr)
             
+            self._load_or_build_i8_cache(cache_file)
+
             if not self.silent:
                 print("Recipe embeddings computed successfully", file=sys.stderr)
-            
+
         except Exception as e:
             raise RuntimeError(f"Error computing embeddings: {str(e)}")
+
+    @staticmethod
+    def _quantize_i8(x: np.ndarray) -> np.ndarray:
+        """
+        Quantize float vectors to int8 with a per-vector max-abs scale.
+
+        Args:
+            x: Float array of shape (N, D) or (D,)
+
+        Returns:
+            int8 array with the same shape
+        """
+        x = np.atleast_2d(x)
+        scale = np.abs(x).max(axis=1, keepdims=True) / 127.0
+        # Guard against all-zero vectors
+        scale[scale == 0] = 1.0
+        return np.round(x / scale).astype(np.int8)
+
+    def _load_or_build_i8_cache(self, cache_file: Path) -> None:
+        """
+        Load (or quantize and cache) the int8 copy of the embedding matrix.
+        int8 cuts memory 4x versus float32 and enables VNNI integer dot
+        kernels in SimSIMD. Cosine similarity is scale-invariant, so the
+        per-vector quantization scale does not affect the ranking.
+
+        Args:
+            cache_file: Path to the float32 embeddings cache (used to derive
+                        the quantized cache filename)
+        """
+        i8_file = cache_file.with_name(cache_file.stem.replace('_norm_v2', '') + '_i8_v2.npz')
+        try:
+            if i8_file.exists():
+                cached = np.load(i8_file)
+                if len(cached['q']) == len(self.recipes):
+                    self.recipe_embeddings_i8 = np.ascontiguousarray(cached['q'])
+                    self.recipe_i8_norms = cached['norms']
+                    return
+
+            self.recipe_embeddings_i8 = np.ascontiguousarray(
+                self._quantize_i8(self.recipe_embeddings)
+            )
+            # Norms of the quantized vectors, pre-computed for the NumPy
+            # fallback cosine (SimSIMD fuses them into its i8 kernel)
+            self.recipe_i8_norms = np.sqrt(
+                (self.recipe_embeddings_i8.astype(np.int32) ** 2).sum(axis=1)
+            ).astype(np.float32)
+            np.savez(i8_file, q=self.recipe_embeddings_i8, norms=self.recipe_i8_norms)
+        except Exception as e:
+            # Quantization is an optimization; fall back to float similarity
+            self.recipe_embeddings_i8 = None
+            self.recipe_i8_norms = None
+            if not self.silent:
+                print(f"Warning: int8 embedding cache unavailable: {e}", file=sys.stderr)
     
     def recommend_recipes(
         self,
@@ -183,9 +579,12 @@ class RecipeRecommender:
                            Recipes below this threshold are filtered out
         
         Returns:
-            List of recipe dictionaries with added 'match_score' field,
-            sorted by relevance (highest match first)
-        
+            List of lightweight result dicts with 'index', 'match_score'
+            and 'ingredient_match_percentage', sorted by relevance
+            (highest match first). Use get_recipe(index) to fetch the full
+            recipe; full dicts are only merged at the serialization
+            boundary to avoid copying recipe data on every query.
+
         Raises:
             ValueError: If inputs are invalid (empty ingredients, invalid top_k)
             RuntimeError: If recipes haven't been loaded yet
@@ -217,54 +616,207 @@ class RecipeRecommender:
             if not available_ingredients:
                 raise ValueError("No valid ingredients provided after parsing")
             
-            # Create ingredient string for encoding
-            user_ingredients = ", ".join(available_ingredients).lower()
-            
-            # Encode user's ingredients
-            user_embedding = self.model.encode(
-                user_ingredients,
-                convert_to_numpy=True
-            )
-            
-            # Calculate cosine similarity between user ingredients and all recipes
-            # Cosine similarity ranges from -1 to 1, where 1 means identical
-            similarities = self._calculate_cosine_similarity(
-                user_embedding,
-                self.recipe_embeddings
-            )
-            
-            # Filter by minimum match score
-            valid_indices = np.where(similarities >= min_match_score)[0]
+            # Cheap exact-overlap stage first: if enough recipes already
+            # match most of the user's ingredients, the semantic stage
+            # adds no signal and the transformer pass is skipped entirely
+            query_mask = self._query_mask(available_ingredients)
+            exact_scores = self._exact_match_scores(query_mask)
+
+            high = np.where(exact_scores > 0.8)[0]
+            if len(high) >= top_k:
+                order = high[np.argsort(-exact_scores[high])][:top_k]
+                return [
+                    {
+                        'index': int(idx),
+                        'match_score': float(exact_scores[idx]),
+                        'ingredient_match_percentage': round(float(exact_scores[idx]) * 100, 2),
+                    }
+                    for idx in order
+                    if exact_scores[idx] >= min_match_score
+                ]
+
+            # Encode user's ingredients (LRU-cached across calls)
+            user_embedding = self._encode_query(available_ingredients)
             
-            if len(valid_indices) == 0:
+            # Calculate cosine similarity between user ingredients and all
+            # recipes (range -1 to 1, where 1 means identical) and select
+            # the top K above the score threshold
+            if self.recipe_embeddings_i8 is not None:
+                # Quantized scan: 4x less memory traffic than float32
+                similarities = self._calculate_cosine_similarity_i8(user_embedding)
+            elif _sim_topk is not None:
+                # Fused Numba kernel: similarity + top-k in a single pass
+                # over the matrix, no intermediate score array handling.
+                # MiniLM's fixed 384-dim width gets the specialized kernel
+                # with a compile-time-constant inner loop.
+                kernel = _sim_topk_384 if self.recipe_embeddings.shape[1] == 384 else _sim_topk
+                # Over-fetch candidates: the kernel ranks by cosine alone,
+                # so a recipe with high exact overlap but sub-top-k cosine
+                # would otherwise be unreachable here while the full-scan
+                # branches (which blend before selecting) could return it.
+                # 4x top_k keeps the candidate set small while making the
+                # branches agree on the final blended ranking.
+                n_cand = min(4 * top_k, self.recipe_embeddings.shape[0])
+                cand_idx, cand_scores = kernel(
+                    self.recipe_embeddings,
+                    np.ascontiguousarray(user_embedding, dtype=np.float32),
+                    n_cand
+                )
+                # Blend semantic and exact signals on the candidate set
+                blended = 0.5 * cand_scores + 0.5 * exact_scores[cand_idx]
+                order = np.argsort(-blended)[:top_k]
+                keep = blended[order] >= min_match_score
+                top_indices = cand_idx[order][keep]
+                top_scores = blended[order][keep]
+                similarities = None
+            else:
+                similarities = self._calculate_cosine_similarity(
+                    user_embedding,
+                    self.recipe_embeddings
+                )
+
+            if similarities is not None:
+                # Blend semantic and exact signals 50/50, then filter by
+                # minimum match score
+                similarities = 0.5 * similarities + 0.5 * exact_scores
+                valid_indices = np.where(similarities >= min_match_score)[0]
+
+                if len(valid_indices) == 0:
+                    return []  # No recipes meet the minimum threshold
+
+                # Get top K indices sorted by similarity (descending).
+                # argpartition selects the best k in O(N); only those k are
+                # then sorted, instead of sorting every valid recipe.
+                k = min(top_k, len(valid_indices))
+                valid_sims = similarities[valid_indices]
+                local = np.argpartition(-valid_sims, kth=k - 1)[:k]
+                top_indices = valid_indices[local[np.argsort(-valid_sims[local])]]
+                top_scores = similarities[top_indices]
+
+            if len(top_indices) == 0:
                 return []  # No recipes meet the minimum threshold
             
-            # Get top K indices sorted by similarity (descending)
-            # We limit to available valid indices
-            k = min(top_k, len(valid_indices))
-            top_indices = valid_indices[
-                np.argsort(similarities[valid_indices])[-k:][::-1]
+            # Index+score pairs only: no per-query copies of recipe dicts
+            recommendations = [
+                {
+                    'index': int(idx),
+                    'match_score': float(score),
+                    'ingredient_match_percentage': round(float(exact_scores[idx]) * 100, 2),
+                }
+                for idx, score in zip(top_indices, top_scores)
             ]
-            
-            # Build result with match scores
-            recommendations = []
-            for idx in top_indices:
-                recipe = self.recipes[idx].copy()  # Create copy to avoid modifying original
-                recipe['match_score'] = float(similarities[idx])
-                
-                # Calculate ingredient match percentage
-                recipe['ingredient_match_percentage'] = self._calculate_ingredient_match(
-                    available_ingredients,
-                    recipe['ingredients']
-                )
-                
-                recommendations.append(recipe)
-            
+
             return recommendations
             
         except Exception as e:
             raise RuntimeError(f"Error during recommendation: {str(e)}")
     
+    def _encode_query(self, available_ingredients: List[str]) -> np.ndarray:
+        """
+        Encode the user's ingredient list, with an LRU cache keyed on the
+        normalized (lowercased, stripped, sorted) ingredient tuple. The
+        same ingredient set in any order hits the cache and skips the
+        transformer forward pass — the most expensive step of a query.
+
+        Args:
+            available_ingredients: List of ingredient strings
+
+        Returns:
+            Unit-norm query embedding (1D float array)
+        """
+        norm_key = tuple(sorted(ing.strip().lower() for ing in available_ingredients))
+        cache_key = (id(self.model), norm_key)
+
+        cached = _ENCODE_CACHE.get(cache_key)
+        if cached is not None:
+            _ENCODE_CACHE.move_to_end(cache_key)
+            return cached
+
+        embedding = self.model.encode(
+            ", ".join(norm_key),
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+        _ENCODE_CACHE[cache_key] = embedding
+        if len(_ENCODE_CACHE) > _ENCODE_CACHE_MAX:
+            _ENCODE_CACHE.popitem(last=False)
+        return embedding
+
+    def recommend_recipes_batch(
+        self,
+        ingredient_lists: List[Union[List[str], str]],
+        top_k: int = 5,
+        min_match_score: float = 0.0
+    ) -> List[List[Dict]]:
+        """
+        Recommend recipes for several queries at once.
+
+        All queries are encoded in one model.encode call and scored with a
+        single Q @ E.T matrix product, amortizing the per-call transformer
+        and BLAS dispatch overhead across the batch (one GEMM instead of
+        one GEMV per query).
+
+        Args:
+            ingredient_lists: One entry per query, each a list of
+                              ingredient strings or a comma-separated string
+            top_k: Number of top recommendations per query
+            min_match_score: Minimum similarity score (0-1)
+
+        Returns:
+            One recommendation list per query, in input order, each in the
+            same lightweight format as recommend_recipes
+        """
+        if not ingredient_lists:
+            return []
+
+        if not self.recipes or self.recipe_embeddings is None:
+            raise RuntimeError("Recipes not loaded. Call load_recipes() first")
+
+        # Normalize every query to a list of ingredient strings
+        parsed = []
+        for ingredients in ingredient_lists:
+            if isinstance(ingredients, str):
+                ingredients = [i.strip() for i in ingredients.split(',') if i.strip()]
+            if not ingredients:
+                raise ValueError("No valid ingredients provided after parsing")
+            parsed.append(ingredients)
+
+        texts = [", ".join(ingredients).lower() for ingredients in parsed]
+        queries = self.model.encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True, batch_size=32
+        )
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+
+        # One GEMM against the pre-normalized recipe matrix
+        sims = queries @ np.asarray(self.recipe_embeddings).T
+
+        results = []
+        for row, ingredients in zip(sims, parsed):
+            # Blend semantic and exact signals 50/50 before filtering so
+            # batch queries rank and threshold identically to the
+            # single-query path
+            exact_scores = self._exact_match_scores(self._query_mask(ingredients))
+            row = 0.5 * row + 0.5 * exact_scores
+
+            valid = np.where(row >= min_match_score)[0]
+            if len(valid) == 0:
+                results.append([])
+                continue
+            k = min(top_k, len(valid))
+            local = np.argpartition(-row[valid], kth=k - 1)[:k]
+            top = valid[local[np.argsort(-row[valid[local]])]]
+
+            results.append([
+                {
+                    'index': int(idx),
+                    'match_score': float(row[idx]),
+                    'ingredient_match_percentage': round(float(exact_scores[idx]) * 100, 2),
+                }
+                for idx in top
+            ])
+        return results
+
     def _calculate_cosine_similarity(
         self,
         vector1: np.ndarray,
@@ -275,47 +827,87 @@ class RecipeRecommender:
         
         Args:
             vector1: Query embedding (1D array)
-            vector2: Recipe embeddings (2D array, one row per recipe)
-        
+            vector2: Pre-normalized recipe embeddings (2D array, one row per recipe)
+
         Returns:
             Array of similarity scores (one per recipe)
         """
-        # Normalize vectors for cosine similarity
-        # cosine_sim = dot(A, B) / (||A|| * ||B||)
+        if simsimd is not None:
+            # Fused dot+norm batch kernel: one pass over the recipe matrix,
+            # no normalized-copy allocations. cdist returns cosine *distance*.
+            distances = np.asarray(
+                simsimd.cdist(vector1[None, :], vector2, metric="cosine")
+            )[0]
+            return 1.0 - distances
+
+        # NumPy fallback: rows of vector2 are unit-length already, so only
+        # the query needs normalizing and the whole similarity is one GEMV.
         vector1_norm = vector1 / np.linalg.norm(vector1)
-        vector2_norm = vector2 / np.linalg.norm(vector2, axis=1, keepdims=True)
-        
-        # Calculate dot product (equivalent to cosine similarity after normalization)
-        return np.dot(vector2_norm, vector1_norm)
+        return vector2 @ vector1_norm
+
+    def _calculate_cosine_similarity_i8(self, user_embedding: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity against the int8 quantized recipe matrix.
+
+        Args:
+            user_embedding: Query embedding (1D float array)
+
+        Returns:
+            Array of similarity scores (one per recipe)
+        """
+        q_user = self._quantize_i8(user_embedding)[0]
+
+        if simsimd is not None:
+            # VNNI int8 cosine kernel (VPDPBUSD on Ice Lake+/Zen4)
+            distances = np.asarray(
+                simsimd.cdist(q_user[None, :], self.recipe_embeddings_i8, metric="cosine")
+            )[0]
+            return 1.0 - distances
+
+        # NumPy fallback: int32 dot product divided by pre-stored norms
+        dots = np.einsum(
+            'ij,j->i',
+            self.recipe_embeddings_i8.astype(np.int32),
+            q_user.astype(np.int32)
+        )
+        user_norm = np.sqrt((q_user.astype(np.int32) ** 2).sum())
+        return dots / (self.recipe_i8_norms * user_norm)
     
-    def _calculate_ingredient_match(
-        self,
-        user_ingredients: List[str],
-        recipe_ingredients: List[str]
-    ) -> float:
+    def get_recipe(self, index: int) -> Dict:
         """
-        Calculate percentage of recipe ingredients that user has.
-        This is a simple exact-match metric (not semantic).
-        
+        Look up the full recipe dict for a recommendation index.
+
         Args:
-            user_ingredients: List of ingredients user has
-            recipe_ingredients: List of ingredients in recipe
-        
+            index: The 'index' field of a recommendation result
+
         Returns:
-            Percentage (0-100) of recipe ingredients user has
+            The recipe dictionary (shared, do not mutate)
         """
-        if not recipe_ingredients:
-            return 0.0
-        
-        # Normalize to lowercase for comparison
-        user_set = set(ing.lower().strip() for ing in user_ingredients)
-        recipe_set = set(ing.lower().strip() for ing in recipe_ingredients)
-        
-        # Calculate overlap
-        matched = len(user_set.intersection(recipe_set))
-        total = len(recipe_set)
-        
-        return round((matched / total) * 100, 2)
+        return self.recipes[index]
+
+    def _exact_match_scores(self, query_mask: np.ndarray) -> np.ndarray:
+        """
+        Exact-match overlap fraction (0-1) for every recipe at once.
+        This is a simple exact-match metric (not semantic): the overlap is
+        a bitwise-AND + popcount against the precomputed recipe bitmasks.
+        Uses the Numba-compiled kernel when available, otherwise a
+        vectorized NumPy popcount.
+
+        Args:
+            query_mask: Packed bitmask of the user's ingredients
+                        (from _query_mask)
+
+        Returns:
+            Array of overlap fractions, one per recipe
+        """
+        if _score_all_masks is not None:
+            return _score_all_masks(self.recipe_masks, self.recipe_totals, query_mask)
+
+        matched = _popcount_rows(self.recipe_masks & query_mask)
+        totals = np.maximum(self.recipe_totals, 1)
+        scores = matched / totals
+        scores[self.recipe_totals == 0] = 0.0
+        return scores
 
 
 def predict_recipes(
@@ -349,12 +941,22 @@ def predict_recipes(
         recommender.load_recipes()
         
         # Get recommendations
-        recommendations = recommender.recommend_recipes(
+        results = recommender.recommend_recipes(
             available_ingredients=ingredients,
             top_k=top_k,
             min_match_score=min_score
         )
-        
+
+        # Merge full recipe data only here, at the serialization boundary
+        recommendations = [
+            {
+                **recommender.get_recipe(r['index']),
+                'match_score': r['match_score'],
+                'ingredient_match_percentage': r['ingredient_match_percentage'],
+            }
+            for r in results
+        ]
+
         return {
             'success': True,
             'count': len(recommendations),
@@ -370,8 +972,85 @@ def predict_recipes(
         }
 
 
+def run_server() -> None:
+    """
+    Persistent worker mode: load the model and recipes once, then answer
+    JSON-lines requests on stdin until EOF. Amortizes the seconds-long
+    model load over every query instead of paying it per CLI invocation.
+
+    Request format (one JSON object per line):
+        {"ingredients": [...] | "a, b, c", "top_k": 5, "min_score": 0.0}
+
+    Each response is one JSON line in the same shape predict_recipes
+    returns.
+    """
+    recommender = RecipeRecommender(silent=True)
+    recommender.load_recipes()
+
+    # Signal readiness so the parent process knows warm-up is done
+    print(json.dumps({'ready': True}), flush=True)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = orjson.loads(line) if orjson is not None else json.loads(line)
+
+            if 'batch' in request:
+                # Several queries coalesced into one encode + one GEMM
+                batch_results = recommender.recommend_recipes_batch(
+                    request['batch'],
+                    top_k=int(request.get('top_k', 5)),
+                    min_match_score=float(request.get('min_score', 0.0))
+                )
+                response = {
+                    'success': True,
+                    'results': [
+                        [
+                            {
+                                **recommender.get_recipe(r['index']),
+                                'match_score': r['match_score'],
+                                'ingredient_match_percentage': r['ingredient_match_percentage'],
+                            }
+                            for r in results
+                        ]
+                        for results in batch_results
+                    ],
+                }
+                print(json.dumps(response), flush=True)
+                continue
+
+            results = recommender.recommend_recipes(
+                available_ingredients=request['ingredients'],
+                top_k=int(request.get('top_k', 5)),
+                min_match_score=float(request.get('min_score', 0.0))
+            )
+            recommendations = [
+                {
+                    **recommender.get_recipe(r['index']),
+                    'match_score': r['match_score'],
+                    'ingredient_match_percentage': r['ingredient_match_percentage'],
+                }
+                for r in results
+            ]
+            response = {
+                'success': True,
+                'count': len(recommendations),
+                'recommendations': recommendations,
+            }
+        except Exception as e:
+            response = {'success': False, 'error': str(e), 'recommendations': []}
+
+        print(json.dumps(response), flush=True)
+
+
 # Example usage and testing
 if __name__ == "__main__":
+    if '--serve' in sys.argv:
+        run_server()
+        sys.exit(0)
+
     # Example 1: Using the class directly
     print("=" * 50)
     print("Example 1: Chicken-based recipes")
@@ -383,10 +1062,11 @@ if __name__ == "__main__":
     user_ingredients = ["chicken", "soy sauce", "rice"]
     results = recommender.recommend_recipes(user_ingredients, top_k=3)
     
-    for i, recipe in enumerate(results, 1):
+    for i, rec in enumerate(results, 1):
+        recipe = recommender.get_recipe(rec['index'])
         print(f"\n{i}. {recipe['name']}")
-        print(f"   Match Score: {recipe['match_score']:.3f}")
-        print(f"   Ingredient Match: {recipe['ingredient_match_percentage']:.1f}%")
+        print(f"   Match Score: {rec['match_score']:.3f}")
+        print(f"   Ingredient Match: {rec['ingredient_match_percentage']:.1f}%")
         print(f"   Ingredients: {', '.join(recipe['ingredients'][:5])}...")
     
     # Example 2: Using the standalone function
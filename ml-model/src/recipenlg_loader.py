@@ -4,7 +4,9 @@ Downloads and processes recipes from the RecipeNLG dataset on Hugging Face
 """
 
 import json
+import multiprocessing as mp
 import os
+import re
 import sys
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -12,22 +14,161 @@ import warnings
 
 warnings.filterwarnings('ignore')
 
+# Optional Rust-backed JSON serializer for the streamed output file.
+# Falls back to the stdlib json module when not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """Serialize one recipe to a compact JSON string (non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+# Precompiled once: strips leading dashes/numbering/parens in a single
+# C-level scan instead of a chain of allocating lstrip calls per line
+_CLEAN_RE = re.compile(r'^[-\s0-9.)]+')
+
+# Matches section headers like "Ingredients:" / "Directions:" / "Instructions:"
+_SECTION_RE = re.compile(r'^(ingredients|directions|instructions)\s*:', re.IGNORECASE)
+
+# Optional Aho-Corasick automaton for cuisine keyword matching.
+# Falls back to plain substring checks when the package isn't installed.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Keyword -> cuisine table; dict order doubles as match priority for the
+# substring fallback path
+CUISINE_KEYWORDS = {
+    "Italian": ['pasta', 'italian', 'pizza', 'parmesan', 'mozzarella', 'basil'],
+    "Indian": ['curry', 'indian', 'garam masala', 'turmeric', 'naan'],
+    "Mexican": ['taco', 'mexican', 'tortilla', 'salsa', 'cilantro', 'jalapeño'],
+    "Asian": ['soy sauce', 'asian', 'stir fry', 'wok', 'ginger', 'sesame'],
+    "Greek": ['greek', 'feta', 'mediterranean', 'olive'],
+    "French": ['french', 'baguette', 'croissant', 'brie'],
+    "Thai": ['thai', 'coconut milk', 'lemongrass', 'fish sauce'],
+}
+
+if ahocorasick is not None:
+    _CUISINE_AUTOMATON = ahocorasick.Automaton()
+    for _cuisine, _words in CUISINE_KEYWORDS.items():
+        for _word in _words:
+            _CUISINE_AUTOMATON.add_word(_word, _cuisine)
+    _CUISINE_AUTOMATON.make_automaton()
+else:
+    _CUISINE_AUTOMATON = None
+
+
+def _parse_one(item: Dict) -> Optional[Dict]:
+    """
+    Parse one raw RecipeNLG item into our recipe format.
+    Top-level so it can be dispatched to multiprocessing workers; the
+    recipe 'id' is assigned by the writer in the parent process since
+    worker completion order is nondeterministic.
+
+    Returns None for items that are malformed or too sparse to keep.
+    """
+    try:
+        recipe_text = item.get('input', '')
+        if not recipe_text:
+            return None
+
+        # Split into sections
+        lines = recipe_text.split('\n')
+        title = lines[0].strip() if lines else "Untitled Recipe"
+
+        # Extract ingredients
+        ingredients = []
+        directions = []
+        current_section = None
+
+        for line in lines[1:]:
+            line = line.strip()
+            if not line:
+                continue
+
+            section = _SECTION_RE.match(line)
+            if section:
+                header = section.group(1).lower()
+                current_section = 'ingredients' if header == 'ingredients' else 'directions'
+                continue
+
+            if current_section == 'ingredients':
+                # Remove leading dashes, numbers, etc.
+                cleaned = _CLEAN_RE.sub('', line).strip()
+                if cleaned and len(cleaned) > 2:
+                    ingredients.append(cleaned)
+            elif current_section == 'directions':
+                # Remove leading dashes, numbers, etc.
+                cleaned = _CLEAN_RE.sub('', line).strip()
+                if cleaned and len(cleaned) > 5:
+                    directions.append(cleaned)
+
+        # Skip recipes with insufficient data
+        if not title or len(ingredients) < 3:
+            return None
+
+        return {
+            "name": title,
+            "ingredients": ingredients[:20],  # Limit to 20 ingredients for performance
+            "description": directions[0][:250] + "..." if directions and directions[0] else "Delicious recipe from All-Recipes database",
+            "cookingTime": estimate_cooking_time(directions),
+            "difficulty": estimate_difficulty(ingredients),
+            "cuisine": detect_cuisine(title, ingredients),
+            "directions": directions[:10],  # Limit to 10 steps
+            "source": "All-Recipes"
+        }
+    except Exception:
+        # Skip problematic recipes
+        return None
+
+
+class _JsonArrayWriter:
+    """
+    Incrementally writes a JSON array to an open text file.
+    Keeps memory flat regardless of how many items are written: each item
+    is serialized and flushed through the file buffer immediately instead
+    of being accumulated in a Python list for one big json.dump at the end.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.count = 0
+
+    def write(self, obj: Dict) -> None:
+        self._f.write('[' if self.count == 0 else ',\n')
+        self._f.write(_dumps(obj))
+        self.count += 1
+
+    def close(self) -> None:
+        if self.count == 0:
+            self._f.write('[')
+        self._f.write(']')
+
 
 def download_recipenlg(
     output_path: str = "data/recipenlg_recipes.json",
     sample_size: int = 5000,
     silent: bool = False
-) -> List[Dict]:
+) -> int:
     """
-    Download RecipeNLG dataset from Hugging Face and convert to our format
-    
+    Download RecipeNLG dataset from Hugging Face and convert to our format.
+    Recipes are streamed to disk as they are parsed, so memory use stays
+    constant even for the full ~2M-recipe dataset.
+
     Args:
         output_path: Where to save the processed recipes
         sample_size: Number of recipes to include (None for all ~2M recipes)
         silent: Suppress output messages
-    
+
     Returns:
-        List of recipe dictionaries
+        Number of recipes written
     """
     try:
         from datasets import load_dataset
@@ -49,9 +190,6 @@ def download_recipenlg(
         if not silent:
             print(f"Total recipes available: {len(dataset):,}", file=sys.stderr)
         
-        # Convert to our format
-        recipes = []
-        
         # Take a sample if specified
         if sample_size and sample_size < len(dataset):
             import random
@@ -60,85 +198,40 @@ def download_recipenlg(
             if not silent:
                 print(f"Processing {sample_size:,} random recipes...", file=sys.stderr)
         
-        for idx, item in enumerate(dataset):
-            try:
-                # Parse the text format recipe
-                recipe_text = item.get('input', '')
-                if not recipe_text:
-                    continue
-                
-                # Split into sections
-                lines = recipe_text.split('\n')
-                title = lines[0].strip() if lines else "Untitled Recipe"
-                
-                # Extract ingredients
-                ingredients = []
-                directions = []
-                current_section = None
-                
-                for line in lines[1:]:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    if 'Ingredients:' in line or 'ingredients:' in line.lower():
-                        current_section = 'ingredients'
-                        continue
-                    elif 'Directions:' in line or 'directions:' in line.lower() or 'Instructions:' in line:
-                        current_section = 'directions'
-                        continue
-                    
-                    if current_section == 'ingredients':
-                        # Remove leading dashes, numbers, etc.
-                        cleaned = line.lstrip('- ').lstrip('0123456789.').lstrip(')').strip()
-                        if cleaned and len(cleaned) > 2:
-                            ingredients.append(cleaned)
-                    elif current_section == 'directions':
-                        # Remove leading dashes, numbers, etc.
-                        cleaned = line.lstrip('- ').lstrip('0123456789.').lstrip(')').strip()
-                        if cleaned and len(cleaned) > 5:
-                            directions.append(cleaned)
-                
-                # Skip recipes with insufficient data
-                if not title or len(ingredients) < 3:
-                    continue
-                
-                recipe = {
-                    "id": len(recipes) + 1,
-                    "name": title,
-                    "ingredients": ingredients[:20],  # Limit to 20 ingredients for performance
-                    "description": directions[0][:250] + "..." if directions and directions[0] else "Delicious recipe from All-Recipes database",
-                    "cookingTime": estimate_cooking_time(directions),
-                    "difficulty": estimate_difficulty(ingredients),
-                    "cuisine": detect_cuisine(title, ingredients),
-                    "directions": directions[:10],  # Limit to 10 steps
-                    "source": "All-Recipes"
-                }
-                
-                recipes.append(recipe)
-                
-                # Progress indicator
-                if not silent and (len(recipes) % 500 == 0):
-                    print(f"Processed {len(recipes):,} recipes...", file=sys.stderr)
-                
-            except Exception as e:
-                # Skip problematic recipes
-                continue
-        
-        # Save to JSON
+        # Convert to our format, streaming each recipe straight to disk
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(recipes, f, indent=2, ensure_ascii=False)
-        
+
+        out = open(output_file, 'w', encoding='utf-8')
+        writer = _JsonArrayWriter(out)
+
+        # Parsing is CPU-bound Python string work and each item is
+        # independent, so shard it across worker processes and stream the
+        # results through the writer as they complete
+        with mp.Pool() as pool:
+            for recipe in pool.imap_unordered(
+                _parse_one, (item for item in dataset), chunksize=256
+            ):
+                if recipe is None:
+                    continue
+
+                recipe["id"] = writer.count + 1
+                writer.write(recipe)
+
+                # Progress indicator
+                if not silent and (writer.count % 500 == 0):
+                    print(f"Processed {writer.count:,} recipes...", file=sys.stderr)
+
+        writer.close()
+        out.close()
+
         file_size_mb = output_file.stat().st_size / (1024 * 1024)
-        
+
         if not silent:
-            print(f"\n✓ Successfully saved {len(recipes):,} recipes to {output_path}", file=sys.stderr)
+            print(f"\n✓ Successfully saved {writer.count:,} recipes to {output_path}", file=sys.stderr)
             print(f"File size: {file_size_mb:.2f} MB", file=sys.stderr)
-        
-        return recipes
+
+        return writer.count
         
     except ImportError:
         error_msg = "Error: 'datasets' library not installed. Run: pip install datasets"
@@ -178,27 +271,21 @@ def estimate_difficulty(ingredients: List[str]) -> str:
 
 def detect_cuisine(title: str, ingredients: List[str]) -> str:
     """Detect cuisine type based on title and ingredients"""
-    title_lower = title.lower()
-    ingredients_str = " ".join(ingredients).lower()
-    
-    # Cuisine keywords
-    if any(word in title_lower or word in ingredients_str for word in ['pasta', 'italian', 'pizza', 'parmesan', 'mozzarella', 'basil']):
-        return "Italian"
-    elif any(word in title_lower or word in ingredients_str for word in ['curry', 'indian', 'garam masala', 'turmeric', 'naan']):
-        return "Indian"
-    elif any(word in title_lower or word in ingredients_str for word in ['taco', 'mexican', 'tortilla', 'salsa', 'cilantro', 'jalapeño']):
-        return "Mexican"
-    elif any(word in title_lower or word in ingredients_str for word in ['soy sauce', 'asian', 'stir fry', 'wok', 'ginger', 'sesame']):
-        return "Asian"
-    elif any(word in title_lower or word in ingredients_str for word in ['greek', 'feta', 'mediterranean', 'olive']):
-        return "Greek"
-    elif any(word in title_lower or word in ingredients_str for word in ['french', 'baguette', 'croissant', 'brie']):
-        return "French"
-    elif any(word in title_lower or word in ingredients_str for word in ['thai', 'coconut milk', 'lemongrass', 'fish sauce']):
-        return "Thai"
-    else:
+    text = f"{title} {' '.join(ingredients)}".lower()
+
+    if _CUISINE_AUTOMATON is not None:
+        # Single DFA pass over the combined text instead of ~40 substring
+        # scans; first keyword hit wins
+        for _, cuisine in _CUISINE_AUTOMATON.iter(text):
+            return cuisine
         return "American"
 
+    # Fallback: ordered substring checks against the same keyword table
+    for cuisine, words in CUISINE_KEYWORDS.items():
+        if any(word in text for word in words):
+            return cuisine
+    return "American"
+
 
 def check_dataset_exists(data_path: str = "data/recipenlg_recipes.json") -> bool:
     """Check if RecipeNLG dataset has already been downloaded"""
@@ -221,13 +308,10 @@ if __name__ == "__main__":
     print(f"Starting RecipeNLG download...")
     print(f"Sample size: {'All (~2M recipes)' if sample_size is None else f'{sample_size:,} recipes'}")
     
-    recipes = download_recipenlg(
+    count = download_recipenlg(
         output_path=args.output,
         sample_size=sample_size,
         silent=False
     )
-    
-    print(f"\n✓ Download complete!")
-    print(f"\nSample recipe:")
-    if recipes:
-        print(json.dumps(recipes[0], indent=2))
+
+    print(f"\n✓ Download complete! {count:,} recipes written to {args.output}")